@@ -18,6 +18,11 @@ setup(
     package_dir={'': 'src'},    
     include_package_data=True,
     install_requires=read_requirements(),
+    entry_points={
+        'console_scripts': [
+            'eurlex-corpus=corpus_builder:main',
+        ],
+    },
     description=DESCRIPTION,
     long_description=read_long_description(),
     long_description_content_type='text/markdown',
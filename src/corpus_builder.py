@@ -0,0 +1,255 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import List
+
+import pandas as pd
+
+from eurlex import get_data_by_celex_id
+
+FORMATS = {'jsonl': '.jsonl', 'json': '.json', 'parquet': '.parquet'}
+PARQUET_COLUMNS = ["celex_id", "kind", "id", "title", "text", "table", "metadata", "notes", "references", "fingerprint",
+                   "document"]
+MANIFEST_NAME = 'manifest.jsonl'
+
+
+def read_celex_ids(path: str) -> List[str]:
+    """
+    Read CELEX IDs from a text file (one per line, # for comments), a CSV file with a CELEX
+    column (e.g. an exported EUR-Lex search result) or a JSON list
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        content = f.read()
+
+    if path.lower().endswith('.json'):
+        items = json.loads(content)
+        celex_ids = [item['celex'] if isinstance(item, dict) else item for item in items]
+    elif path.lower().endswith('.csv'):
+        rows = list(csv.DictReader(content.splitlines()))
+        column = next((name for name in (rows[0].keys() if rows else []) if name.strip().lower() in ('celex', 'celex number', 'celex_id')), None)
+        if column is None:
+            raise ValueError(f"No CELEX column found in {path}")
+        celex_ids = [row[column] for row in rows]
+    else:
+        celex_ids = [line.split('#')[0] for line in content.splitlines()]
+
+    celex_ids = [celex_id.strip() for celex_id in celex_ids if celex_id and celex_id.strip()]
+    return list(dict.fromkeys(celex_ids))
+
+
+def write_atomic(path: str, write):
+    # Write to a temporary file in the same directory, then rename it over the target
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def document_units(celex_id: str, data: dict) -> List[dict]:
+    # Rows for the JSON Lines and columnar outputs: a 'document' row with the document-level
+    # fields (title, preamble, notes, summary, ...), then one row per article and annex
+    document = {key: value for key, value in data.items() if key not in ('articles', 'annexes')}
+    units = [dict(celex_id=celex_id, kind='document', **document)]
+    units += [dict(celex_id=celex_id, kind='article', **article) for article in data.get('articles', [])]
+    units += [dict(celex_id=celex_id, kind='annex', **annex) for annex in data.get('annexes', [])]
+    return units
+
+
+def output_name(celex_id: str, output_format: str) -> str:
+    return celex_id.replace('/', '_') + FORMATS[output_format]
+
+
+def parquet_engine() -> str:
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        pass
+    try:
+        import fastparquet  # noqa: F401
+        return 'fastparquet'
+    except ImportError:
+        return None
+
+
+def write_parquet(f, df):
+    # Every column is written as a nullable string, so all files of a corpus share one schema
+    # even when a column is empty in a document (e.g. 'table' for an act without annexes)
+    engine = parquet_engine()
+    if engine == 'pyarrow':
+        import pyarrow as pa
+        schema = pa.schema([(column, pa.string()) for column in df.columns])
+        df.to_parquet(f, engine=engine, index=False, schema=schema)
+    else:
+        df.to_parquet(f, engine=engine, index=False, object_encoding='utf8')
+
+
+def write_document(celex_id: str, data: dict, output_dir: str, output_format: str) -> str:
+    path = os.path.join(output_dir, output_name(celex_id, output_format))
+    if output_format == 'json':
+        payload = json.dumps(data, indent=4).encode('utf-8')
+        write_atomic(path, lambda f: f.write(payload))
+    elif output_format == 'jsonl':
+        lines = ''.join(json.dumps(unit) + '\n' for unit in document_units(celex_id, data))
+        write_atomic(path, lambda f: f.write(lines.encode('utf-8')))
+    else:
+        rows = []
+        for unit in document_units(celex_id, data):
+            # Fields without their own column (preamble, summary, ...) go to the 'document' column
+            extra = {key: value for key, value in unit.items() if key not in PARQUET_COLUMNS}
+            row = {key: value for key, value in unit.items() if key in PARQUET_COLUMNS}
+            row['document'] = json.dumps(extra) if extra else None
+            rows.append(row)
+        df = pd.DataFrame(rows, columns=PARQUET_COLUMNS)
+        # Nested values are stored as JSON strings to keep a flat columnar schema
+        for column in ("metadata", "notes", "references"):
+            df[column] = df[column].map(lambda value: json.dumps(value) if isinstance(value, (dict, list)) else None)
+        for column in df.columns:
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
+        write_atomic(path, lambda f: write_parquet(f, df))
+    return os.path.basename(path)
+
+
+class Manifest:
+    """
+    Per-ID status log. Every update is appended and fsynced, so a crash loses at most the
+    document being written; the latest entry for an ID wins when the manifest is loaded.
+    Output paths are stored relative to the output directory.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line after a crash
+                    self.entries[entry['celex_id']] = entry
+        self.compact()
+
+    def compact(self):
+        lines = ''.join(json.dumps(entry) + '\n' for entry in self.entries.values())
+        write_atomic(self.path, lambda f: f.write(lines.encode('utf-8')))
+
+    def update(self, celex_id: str, status: str, **fields):
+        with self.lock:
+            entry = dict(self.entries.get(celex_id, {}), celex_id=celex_id, status=status, **fields)
+            entry['updated'] = datetime.now(timezone.utc).isoformat()
+            if status != 'failed':
+                entry.pop('error', None)
+            self.entries[celex_id] = entry
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def is_done(self, celex_id: str, output_format: str) -> bool:
+        # Done in another format counts as not done, so switching formats fetches again
+        entry = self.entries.get(celex_id)
+        if not entry or entry['status'] != 'done' or entry.get('format') != output_format:
+            return False
+        return os.path.exists(os.path.join(self.output_dir, entry.get('output', '')))
+
+
+def process_celex_id(celex_id, manifest, args):
+    attempts = manifest.entries.get(celex_id, {}).get('attempts', 0)
+    for retry in range(args.retries + 1):
+        attempts += 1
+        manifest.update(celex_id, 'running', attempts=attempts, format=args.format)
+        try:
+            data = get_data_by_celex_id(celex_id, args.language)
+            output = write_document(celex_id, data, args.output_dir, args.format)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if retry < args.retries:
+                time.sleep(args.retry_delay * 2 ** retry)
+                continue
+            manifest.update(celex_id, 'failed', attempts=attempts, error=error)
+            return False
+        manifest.update(celex_id, 'done', attempts=attempts, output=output)
+        return True
+
+
+def build_corpus(args) -> int:
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest = Manifest(args.output_dir)
+
+    celex_ids = read_celex_ids(args.input)
+    todo = [celex_id for celex_id in celex_ids if not manifest.is_done(celex_id, args.format)]
+    print(f"{len(celex_ids)} documents, {len(celex_ids) - len(todo)} already done, {len(todo)} to process", file=sys.stderr)
+    other_format = sum(
+        1 for celex_id in todo
+        if manifest.entries.get(celex_id, {}).get('status') == 'done'
+        and manifest.entries[celex_id].get('format') != args.format
+    )
+    if other_format:
+        print(f"{other_format} documents were done in another format and will be fetched again as {args.format}", file=sys.stderr)
+
+    failed = 0
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    futures = {executor.submit(process_celex_id, celex_id, manifest, args): celex_id for celex_id in todo}
+    try:
+        for i, future in enumerate(as_completed(futures), 1):
+            celex_id = futures[future]
+            ok = future.result()
+            failed += not ok
+            status = 'done' if ok else 'failed: ' + manifest.entries[celex_id]['error']
+            print(f"[{i}/{len(todo)}] {celex_id} {status}", file=sys.stderr)
+    except KeyboardInterrupt:
+        # Drop the queued documents, the ones in flight stay 'running' and are retried next run
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+        print("Interrupted, waiting for the documents in progress. Re-run the same command to resume.", file=sys.stderr)
+        return 130
+    executor.shutdown()
+
+    print(f"Finished, {failed} failed. Re-run the same command to retry failures.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='eurlex-corpus',
+        description='Fetch and parse a list of CELEX IDs into a corpus directory. '
+                    'Progress is recorded in a manifest, re-running resumes and retries failures.'
+    )
+    parser.add_argument('input', help='File with CELEX IDs: text (one per line), CSV with a CELEX column or JSON list')
+    parser.add_argument('-o', '--output-dir', default='corpus', help='Output directory (default: corpus)')
+    parser.add_argument('-f', '--format', choices=sorted(FORMATS), default='jsonl',
+                        help='jsonl/parquet: one document row plus one row per article and annex, '
+                             'json: full document (default: jsonl)')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='Number of concurrent downloads (default: 4)')
+    parser.add_argument('-l', '--language', default='en', help='Document language (default: en)')
+    parser.add_argument('--retries', type=int, default=2, help='Retries per document within a run (default: 2)')
+    parser.add_argument('--retry-delay', type=float, default=5.0, help='Initial retry delay in seconds (default: 5)')
+    args = parser.parse_args(argv)
+
+    if args.format == 'parquet' and parquet_engine() is None:
+        parser.error("Parquet output requires pyarrow or fastparquet")
+
+    return build_corpus(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
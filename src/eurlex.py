@@ -6,9 +6,11 @@ import json
 from utils import html_table_to_markdown
 from utils import extract_directives_and_regulations
 from utils import extract_directive_and_regulation_at_beginning
+from utils import compute_fingerprint
 import pandas as pd
 import warnings
 from urllib.parse import urljoin
+import difflib
 
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 
@@ -72,6 +74,7 @@ def parse_annexes(soup):
         annex_data['text'] = annex_text
         annex_data['table'] = annex_table
         annex_data['references'] = extract_directives_and_regulations(annex_text)
+        annex_data['fingerprint'] = compute_fingerprint(annex_title, annex_text, annex_table)
         annexes.append(annex_data)
     return annexes
 
@@ -136,6 +139,7 @@ def parse_articles(soup):
         article_data['metadata'] = parent_info
         article_data['notes'] = notes
         article_data['references'] = extract_directives_and_regulations(article_text)
+        article_data['fingerprint'] = compute_fingerprint(article_title, article_text)
         articles.append(article_data)
     return articles
 
@@ -263,10 +267,12 @@ def extract_annexes_from_soup(soup):
             next_annexe = annexetitre_ps[i + 1] if i < len(annexetitre_ps) - 1 else end_tag
             annex_text = extract_text_between(current_annexe, next_annexe)
             
+            annex_title = annex_title if annex_title else annex_id_title
             annexes.append({
                 "id": annex_id if annex_id else annex_id_title,
-                "title": annex_title if annex_title else annex_id_title,
-                "text": annex_text
+                "title": annex_title,
+                "text": annex_text,
+                "fingerprint": compute_fingerprint(annex_title, annex_text)
             })
     
     return annexes
@@ -500,7 +506,8 @@ def parse_pc_soup_data(soup):
                     "text": article_text,
                     "notes": article_notes,
                     "metadata": current_metadata,
-                    "references": extract_directives_and_regulations(article_text)
+                    "references": extract_directives_and_regulations(article_text),
+                    "fingerprint": compute_fingerprint(article_title, article_text)
                 })
                     
     final_part = ""
@@ -558,6 +565,83 @@ def get_json_by_celex_id(celex_id) -> str:
     data = get_data_by_celex_id(celex_id)
     return json.dumps(data, indent=4)
 
+def get_unit_fingerprint(unit: dict) -> str:
+    # Documents parsed before fingerprints were added get theirs computed on the fly
+    if unit.get('fingerprint'):
+        return unit['fingerprint']
+    parts = [unit.get('title', ''), unit.get('text', '')]
+    if 'table' in unit:
+        parts.append(unit['table'])
+    return compute_fingerprint(*parts)
+
+def unique_unit_ids(units: list) -> OrderedDict:
+    # Repeated ids (e.g. annexes without a title paragraph all have the id '') get the
+    # occurrence number appended from the second one on: '', ' #2', ' #3'
+    result = OrderedDict()
+    counts = {}
+    for unit in units:
+        unit_id = unit.get('id', '')
+        counts[unit_id] = counts.get(unit_id, 0) + 1
+        if counts[unit_id] > 1:
+            unit_id = f"{unit_id} #{counts[unit_id]}"
+        result[unit_id] = unit
+    return result
+
+def diff_units(old_units: list, new_units: list) -> dict:
+    """
+    Compare two lists of articles or annexes by id.
+    An id is reported as moved when its metadata changed or its order relative to the other
+    common ids changed, so it can be both modified and moved. Repeated ids are made unique
+    with unique_unit_ids and matched by occurrence.
+    """
+    old = unique_unit_ids(old_units)
+    new = unique_unit_ids(new_units)
+    common_old = [unit_id for unit_id in old if unit_id in new]
+    common_new = [unit_id for unit_id in new if unit_id in old]
+
+    matcher = difflib.SequenceMatcher(None, common_old, common_new, autojunk=False)
+    in_order = set()
+    for block in matcher.get_matching_blocks():
+        in_order.update(common_new[block.b:block.b + block.size])
+
+    modified = []
+    moved = []
+    unchanged = []
+    for unit_id in common_new:
+        old_unit, new_unit = old[unit_id], new[unit_id]
+        is_modified = get_unit_fingerprint(old_unit) != get_unit_fingerprint(new_unit)
+        is_moved = unit_id not in in_order or dict(old_unit.get('metadata') or {}) != dict(new_unit.get('metadata') or {})
+        if is_modified:
+            modified.append(unit_id)
+        if is_moved:
+            moved.append(unit_id)
+        if not is_modified and not is_moved:
+            unchanged.append(unit_id)
+
+    return {
+        'added': [unit_id for unit_id in new if unit_id not in old],
+        'removed': [unit_id for unit_id in old if unit_id not in new],
+        'modified': modified,
+        'moved': moved,
+        'unchanged': unchanged
+    }
+
+def diff_documents(old: dict, new: dict) -> dict:
+    """
+    Compare two parsed versions of a document, e.g. the outputs of get_data_by_celex_id
+    for an act and one of its consolidated versions
+    """
+    return {
+        'articles': diff_units(old.get('articles', []), new.get('articles', [])),
+        'annexes': diff_units(old.get('annexes', []), new.get('annexes', []))
+    }
+
+def get_document_by_celex_id(celex_id: str, language: str = "en") -> "Document":
+    # The typed model is optional, only import it when it is asked for
+    from result_model import Document
+    data = get_data_by_celex_id(celex_id, language)
+    return Document.from_dict(data)
+
 def get_articles_by_celex_id(celex_id) -> pd.DataFrame:
     data = get_data_by_celex_id(celex_id)
     articles = data['articles']
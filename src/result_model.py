@@ -0,0 +1,243 @@
+import json
+import sys
+from typing import List
+
+
+class _Interner:
+    """
+    Shares repeated strings and tuples (metadata, references, dict key orders) between records
+    """
+
+    def __init__(self):
+        self.tuples = {}
+        self.notes = {}
+
+    def string(self, value):
+        return sys.intern(value) if isinstance(value, str) else value
+
+    def strings(self, values):
+        if values is None:
+            return None
+        return self.tuple(tuple(self.string(value) for value in values))
+
+    def tuple(self, value):
+        return self.tuples.setdefault(value, value)
+
+    def metadata(self, metadata):
+        if metadata is None:
+            return None
+        return self.tuple(tuple((self.string(k), self.string(v)) for k, v in metadata.items()))
+
+
+def _split(data, fields, interner):
+    keys = interner.strings(data.keys())
+    extra = {key: value for key, value in data.items() if key not in fields}
+    return keys, extra or None
+
+
+class Note:
+    __slots__ = ('_keys', '_extra', 'id', 'text', 'url', 'external_refs', 'reference')
+    _fields = ('id', 'text', 'url', 'external_refs', 'reference')
+
+    @classmethod
+    def from_dict(cls, data, interner):
+        note = cls()
+        note._keys, note._extra = _split(data, cls._fields, interner)
+        note.id = interner.string(data.get('id'))
+        note.text = data.get('text')
+        note.url = interner.string(data.get('url'))
+        note.external_refs = interner.strings(data.get('external_refs'))
+        note.reference = interner.string(data.get('reference'))
+        return note
+
+    def dedup_key(self):
+        extra = json.dumps(self._extra, sort_keys=True) if self._extra else None
+        return (self._keys, self.id, self.text, self.url, self.external_refs, self.reference, extra)
+
+    def to_dict(self) -> dict:
+        data = {}
+        for key in self._keys:
+            if key == 'external_refs':
+                data[key] = _list(self.external_refs)
+            elif key in self._fields:
+                data[key] = getattr(self, key)
+            else:
+                data[key] = self._extra[key]
+        return data
+
+
+def _list(values):
+    return list(values) if values is not None else None
+
+
+def _load_notes(notes, document, interner):
+    # Notes are stored once per document and referenced by their position in document.notes
+    if notes is None:
+        return None
+    ids = []
+    for data in notes:
+        note = Note.from_dict(data, interner)
+        key = note.dedup_key()
+        if key not in interner.notes:
+            interner.notes[key] = len(document.notes)
+            document.notes.append(note)
+        ids.append(interner.notes[key])
+    return tuple(ids)
+
+
+class Section:
+    """
+    Preamble, explanatory memorandum or financial statement
+    """
+    __slots__ = ('_keys', '_extra', 'text', 'note_ids', 'references')
+    _fields = ('text', 'notes', 'references')
+
+    @classmethod
+    def from_dict(cls, data, document, interner):
+        section = cls()
+        section._keys, section._extra = _split(data, cls._fields, interner)
+        section.text = data.get('text')
+        section.note_ids = _load_notes(data.get('notes'), document, interner)
+        section.references = interner.strings(data.get('references'))
+        return section
+
+    def to_dict(self, document) -> dict:
+        return _unit_to_dict(self, document)
+
+
+class Article:
+    __slots__ = ('_keys', '_extra', 'id', 'title', 'text', 'metadata', 'note_ids', 'references', 'fingerprint')
+    _fields = ('id', 'title', 'text', 'metadata', 'notes', 'references', 'fingerprint')
+
+    @classmethod
+    def from_dict(cls, data, document, interner):
+        article = cls()
+        article._keys, article._extra = _split(data, cls._fields, interner)
+        article.id = interner.string(data.get('id'))
+        article.title = interner.string(data.get('title'))
+        article.text = data.get('text')
+        article.metadata = interner.metadata(data.get('metadata'))
+        article.note_ids = _load_notes(data.get('notes'), document, interner)
+        article.references = interner.strings(data.get('references'))
+        article.fingerprint = data.get('fingerprint')
+        return article
+
+    def to_dict(self, document) -> dict:
+        return _unit_to_dict(self, document)
+
+
+class Annex:
+    __slots__ = ('_keys', '_extra', 'id', 'title', 'text', 'table', 'references', 'fingerprint')
+    _fields = ('id', 'title', 'text', 'table', 'references', 'fingerprint')
+
+    @classmethod
+    def from_dict(cls, data, interner):
+        annex = cls()
+        annex._keys, annex._extra = _split(data, cls._fields, interner)
+        annex.id = interner.string(data.get('id'))
+        annex.title = interner.string(data.get('title'))
+        annex.text = data.get('text')
+        annex.table = data.get('table')
+        annex.references = interner.strings(data.get('references'))
+        annex.fingerprint = data.get('fingerprint')
+        return annex
+
+    def to_dict(self, document=None) -> dict:
+        return _unit_to_dict(self, document)
+
+
+def _unit_to_dict(unit, document):
+    data = {}
+    for key in unit._keys:
+        if key == 'notes':
+            data[key] = document.note_dicts(unit.note_ids)
+        elif key == 'metadata':
+            data[key] = dict(unit.metadata) if unit.metadata is not None else None
+        elif key == 'references':
+            data[key] = _list(unit.references)
+        elif key in unit._fields:
+            data[key] = getattr(unit, key)
+        else:
+            data[key] = unit._extra[key]
+    return data
+
+
+class Document:
+    """
+    Typed form of the dictionary returned by get_data_by_celex_id / parse_pc_soup_data.
+    Notes are stored once in `notes` and referenced by index, metadata and reference strings are
+    interned. to_dict() gives back the original dictionary shape.
+    """
+    __slots__ = ('_keys', '_extra', 'title', 'preamble', 'explantory_memorandum', 'articles',
+                 'final_part', 'notes', 'note_ids', 'references', 'annexes', 'summary',
+                 'related_documents', 'financial_statement')
+    _sections = ('preamble', 'explantory_memorandum', 'financial_statement')
+    _fields = ('title', 'articles', 'final_part', 'notes', 'references', 'annexes', 'summary',
+               'related_documents') + _sections
+
+    @classmethod
+    def from_dict(cls, data: dict, interner: _Interner = None) -> 'Document':
+        # Pass the same interner to share strings across a corpus of documents
+        interner = interner or _Interner()
+        interner.notes = {}
+        document = cls()
+        document._keys, document._extra = _split(data, cls._fields, interner)
+        document.notes = []
+        for key in cls._sections:
+            section = data.get(key)
+            setattr(document, key, Section.from_dict(section, document, interner) if section is not None else None)
+        document.title = data.get('title')
+        articles = data.get('articles')
+        document.articles = [Article.from_dict(article, document, interner) for article in articles] if articles is not None else None
+        document.final_part = data.get('final_part')
+        document.note_ids = _load_notes(data.get('notes'), document, interner)
+        document.references = interner.strings(data.get('references'))
+        annexes = data.get('annexes')
+        document.annexes = [Annex.from_dict(annex, interner) for annex in annexes] if annexes is not None else None
+        document.summary = data.get('summary')
+        document.related_documents = data.get('related_documents')
+        interner.notes = {}
+        return document
+
+    @classmethod
+    def from_json(cls, json_data: str, interner: _Interner = None) -> 'Document':
+        return cls.from_dict(json.loads(json_data), interner)
+
+    def to_dict(self) -> dict:
+        data = {}
+        for key in self._keys:
+            if key == 'notes':
+                data[key] = self.note_dicts(self.note_ids)
+            elif key not in self._fields:
+                data[key] = self._extra[key]
+            elif getattr(self, key) is None:
+                data[key] = None
+            elif key in self._sections:
+                data[key] = getattr(self, key).to_dict(self)
+            elif key in ('articles', 'annexes'):
+                data[key] = [unit.to_dict(self) for unit in getattr(self, key)]
+            elif key == 'references':
+                data[key] = list(self.references)
+            else:
+                data[key] = getattr(self, key)
+        return data
+
+    def note_dicts(self, note_ids) -> List[dict]:
+        if note_ids is None:
+            return None
+        return [self.notes[i].to_dict() for i in note_ids]
+
+    def to_json(self, indent: int = 4) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def article_notes(self, article: Article) -> List[Note]:
+        return [self.notes[i] for i in article.note_ids or ()]
+
+
+def load_corpus(documents: List[dict]) -> List[Document]:
+    """
+    Convert many parsed documents sharing one interner, so metadata and reference strings
+    are stored once across the corpus
+    """
+    interner = _Interner()
+    return [Document.from_dict(data, interner) for data in documents]
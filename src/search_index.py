@@ -0,0 +1,233 @@
+import hashlib
+import json
+import re
+import sqlite3
+from typing import List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    celex_id TEXT PRIMARY KEY,
+    title TEXT,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS units (
+    rowid INTEGER PRIMARY KEY,
+    celex_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    unit_id TEXT,
+    position INTEGER,
+    title TEXT,
+    text TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS units_celex_id ON units (celex_id);
+CREATE TABLE IF NOT EXISTS unit_references (
+    unit_rowid INTEGER NOT NULL,
+    celex_id TEXT NOT NULL,
+    reference TEXT NOT NULL,
+    normalized TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS unit_references_normalized ON unit_references (normalized);
+CREATE INDEX IF NOT EXISTS unit_references_celex_id ON unit_references (celex_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS units_fts USING fts5 (
+    title, text, metadata,
+    content='units', content_rowid='rowid'
+);
+"""
+
+def normalize_reference(reference: str) -> str:
+    """
+    Canonical key for a cited act: act type plus number, so that 'Regulation (EU) No 575/2013',
+    'Regulation (EU) 575/2013' and 'Regulation 575/2013' match. The issuing institution, the
+    (EU)/(EC)/(EEC)/(Euratom) markers, 'No' and a trailing '/EU'-style suffix are dropped.
+    References not in that form only have whitespace and case normalized.
+    """
+    reference = re.sub(r'\s+', ' ', reference).strip()
+    reference = re.sub(r'\s*/\s*', '/', reference).casefold()
+    match = re.search(r'\b(directive|regulation|decision|recommendation)s?\b.*?(\d+/\d+)', reference)
+    if match:
+        return match.group(1) + ' ' + match.group(2)
+    return reference
+
+
+def quote_query(query: str) -> str:
+    # Quote every keyword so that '-', '(', '/', "'" or AND/OR/NOT are not read as FTS5 syntax
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def metadata_path(metadata) -> str:
+    # e.g. "PART ONE GENERAL PROVISIONS > TITLE II LEVEL OF APPLICATION OF REQUIREMENTS"
+    if not metadata:
+        return ''
+    return ' > '.join(' '.join(filter(None, [key, value])) for key, value in metadata.items())
+
+
+def document_hash(data: dict) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SearchIndex:
+    """
+    On-disk SQLite FTS5 index over the output of get_data_by_celex_id / parse_pc_soup_data.
+    Articles and annexes are indexed as units (title, text and metadata path), references are
+    stored normalized for exact lookup.
+    """
+
+    def __init__(self, path: str = 'eurlex_index.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_document(self, celex_id: str, data: dict, force: bool = False) -> bool:
+        """
+        Add or replace a parsed document. Unchanged documents are skipped unless force is set.
+        Returns True if the index was updated.
+        """
+        content_hash = document_hash(data)
+        row = self.conn.execute('SELECT content_hash FROM documents WHERE celex_id = ?', (celex_id,)).fetchone()
+        if row and row['content_hash'] == content_hash and not force:
+            return False
+
+        with self.conn:
+            self._delete_units(celex_id)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO documents (celex_id, title, content_hash) VALUES (?, ?, ?)',
+                (celex_id, data.get('title', ''), content_hash)
+            )
+            units = [('article', unit) for unit in data.get('articles', [])]
+            units += [('annex', unit) for unit in data.get('annexes', [])]
+            for position, (kind, unit) in enumerate(units):
+                self._insert_unit(celex_id, kind, position, unit)
+        return True
+
+    def remove_document(self, celex_id: str):
+        with self.conn:
+            self._delete_units(celex_id)
+            self.conn.execute('DELETE FROM documents WHERE celex_id = ?', (celex_id,))
+
+    def _insert_unit(self, celex_id, kind, position, unit):
+        title = unit.get('title', '')
+        text = unit.get('text', '')
+        if unit.get('table'):
+            text = text + '\n' + unit['table']
+        metadata = metadata_path(unit.get('metadata'))
+        cursor = self.conn.execute(
+            'INSERT INTO units (celex_id, kind, unit_id, position, title, text, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (celex_id, kind, unit.get('id', ''), position, title, text, metadata)
+        )
+        rowid = cursor.lastrowid
+        self.conn.execute(
+            'INSERT INTO units_fts (rowid, title, text, metadata) VALUES (?, ?, ?, ?)',
+            (rowid, title, text, metadata)
+        )
+        references = list(dict.fromkeys(unit.get('references') or []))
+        self.conn.executemany(
+            'INSERT INTO unit_references (unit_rowid, celex_id, reference, normalized) VALUES (?, ?, ?, ?)',
+            [(rowid, celex_id, ref, normalize_reference(ref)) for ref in references]
+        )
+
+    def _delete_units(self, celex_id):
+        # External content FTS tables need the old values to remove the entries
+        rows = self.conn.execute(
+            'SELECT rowid, title, text, metadata FROM units WHERE celex_id = ?', (celex_id,)
+        ).fetchall()
+        self.conn.executemany(
+            "INSERT INTO units_fts (units_fts, rowid, title, text, metadata) VALUES ('delete', ?, ?, ?, ?)",
+            [(row['rowid'], row['title'], row['text'], row['metadata']) for row in rows]
+        )
+        self.conn.execute('DELETE FROM unit_references WHERE celex_id = ?', (celex_id,))
+        self.conn.execute('DELETE FROM units WHERE celex_id = ?', (celex_id,))
+
+    def search(self, query: str, limit: int = 20, celex_id: str = None, kind: str = None,
+               raw: bool = False) -> List[dict]:
+        """
+        Keyword search, every keyword must match, e.g. 'own-funds Article 4(1)'. With raw=True the
+        query uses the FTS5 syntax, e.g. 'liquidity OR coverage' or 'title: "own funds"'.
+        Results are ordered by relevance.
+        """
+        if not raw:
+            query = quote_query(query)
+            if not query:
+                return []
+        sql = (
+            'SELECT u.celex_id, u.kind, u.unit_id, u.title, u.metadata, '
+            "snippet(units_fts, 1, '[', ']', '...', 16) AS snippet, bm25(units_fts) AS score "
+            'FROM units_fts JOIN units u ON u.rowid = units_fts.rowid '
+            'WHERE units_fts MATCH ?'
+        )
+        params = [query]
+        if celex_id:
+            sql += ' AND u.celex_id = ?'
+            params.append(celex_id)
+        if kind:
+            sql += ' AND u.kind = ?'
+            params.append(kind)
+        sql += ' ORDER BY score LIMIT ?'
+        params.append(limit)
+        return [self._row_to_dict(row) for row in self.conn.execute(sql, params)]
+
+    def search_metadata(self, text: str, limit: int = 20, celex_id: str = None) -> List[dict]:
+        # Phrase match on the metadata path, e.g. "TITLE II" or "Chapter 1"
+        phrase = '"' + text.replace('"', '""') + '"'
+        return self.search('metadata: ' + phrase, limit=limit, celex_id=celex_id, raw=True)
+
+    def search_references(self, reference: str, limit: int = 100) -> List[dict]:
+        """
+        Find the articles and annexes citing the given act, e.g. 'Directive 2013/36/EU',
+        matched on the key from normalize_reference.
+        """
+        rows = self.conn.execute(
+            'SELECT u.celex_id, u.kind, u.unit_id, u.title, u.metadata, r.reference '
+            'FROM unit_references r JOIN units u ON u.rowid = r.unit_rowid '
+            'WHERE r.normalized = ? ORDER BY u.celex_id, u.position LIMIT ?',
+            (normalize_reference(reference), limit)
+        )
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_unit(self, celex_id: str, unit_id: str, kind: str = 'article') -> dict:
+        row = self.conn.execute(
+            'SELECT celex_id, kind, unit_id, title, text, metadata FROM units '
+            'WHERE celex_id = ? AND unit_id = ? AND kind = ?',
+            (celex_id, unit_id, kind)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def documents(self) -> List[str]:
+        return [row['celex_id'] for row in self.conn.execute('SELECT celex_id FROM documents ORDER BY celex_id')]
+
+    def optimize(self):
+        # Merge FTS5 b-trees after large bulk loads
+        with self.conn:
+            self.conn.execute("INSERT INTO units_fts (units_fts) VALUES ('optimize')")
+
+    @staticmethod
+    def _row_to_dict(row):
+        data = dict(row)
+        if 'unit_id' in data:
+            data['id'] = data.pop('unit_id')
+        return data
+
+
+def build_index_from_json_files(paths: List[str], index_path: str = 'eurlex_index.db') -> SearchIndex:
+    """
+    Index JSON files as written by get_json_by_celex_id, the file name is used as the CELEX ID
+    """
+    index = SearchIndex(index_path)
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        celex_id = re.sub(r'\.json$', '', path.replace('\\', '/').split('/')[-1])
+        index.add_document(celex_id, data)
+    return index
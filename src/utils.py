@@ -1,4 +1,5 @@
 from bs4 import BeautifulSoup
+import hashlib
 import re
 from typing import List
 
@@ -135,4 +136,9 @@ def extract_directives_and_regulations(text: str) -> List[str]:
         unique_results.extend(regulations_list)
         unique_results = list(dict.fromkeys(unique_results))
 
-    return unique_results
\ No newline at end of file
+    return unique_results
+
+def compute_fingerprint(*parts: str) -> str:
+    # Whitespace is collapsed so that layout-only changes do not alter the fingerprint
+    content = '\x1f'.join(re.sub(r'\s+', ' ', part or '').strip() for part in parts)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
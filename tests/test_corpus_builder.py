@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+import corpus_builder
+from conftest import EXAMPLES_DIR
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    # Stub fetch over the example JSONs, IDs in `failing` raise
+    calls = []
+    failing = set()
+
+    def fetch(celex_id, language='en'):
+        calls.append(celex_id)
+        if celex_id in failing:
+            raise RuntimeError('fetch failed')
+        with open(os.path.join(EXAMPLES_DIR, celex_id + '.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    monkeypatch.setattr(corpus_builder, 'get_data_by_celex_id', fetch)
+    return calls, failing
+
+
+@pytest.fixture
+def ids_file(tmp_path):
+    path = tmp_path / 'ids.txt'
+    path.write_text('32013L0036\n# comment\n32019L0878\n52021PC0206\n32013L0036\n')
+    return str(path)
+
+
+def run(ids_file, output_dir, *args):
+    return corpus_builder.main([ids_file, '-o', str(output_dir), '--retries', '0', '--retry-delay', '0', *args])
+
+
+def test_read_celex_ids(ids_file):
+    assert corpus_builder.read_celex_ids(ids_file) == ['32013L0036', '32019L0878', '52021PC0206']
+
+
+def test_resume_retries_only_failures(fetched, ids_file, tmp_path):
+    calls, failing = fetched
+    output_dir = tmp_path / 'out'
+
+    failing.add('32019L0878')
+    assert run(ids_file, output_dir) == 1
+    assert sorted(os.listdir(output_dir)) == ['32013L0036.jsonl', '52021PC0206.jsonl', 'manifest.jsonl']
+
+    calls.clear()
+    failing.clear()
+    assert run(ids_file, output_dir) == 0
+    assert calls == ['32019L0878']
+
+    calls.clear()
+    assert run(ids_file, output_dir) == 0
+    assert calls == []
+
+    with open(output_dir / '32013L0036.jsonl', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert [row['celex_id'] for row in rows] == ['32013L0036'] * len(rows)
+    assert rows[1]['kind'] == 'article'
+
+
+def test_row_formats_keep_document_fields(fetched, ids_file, tmp_path):
+    assert run(ids_file, tmp_path / 'out') == 0
+    with open(tmp_path / 'out' / '52021PC0206.jsonl', encoding='utf-8') as f:
+        document = json.loads(f.readline())
+    with open(os.path.join(EXAMPLES_DIR, '52021PC0206.json'), encoding='utf-8') as f:
+        data = json.load(f)
+    assert document['kind'] == 'document'
+    for key in ('title', 'explantory_memorandum', 'preamble', 'notes', 'financial_statement'):
+        assert document[key] == data[key]
+
+
+def test_resume_from_other_directory(fetched, ids_file, tmp_path, monkeypatch):
+    calls, _ = fetched
+    assert run(ids_file, tmp_path / 'out') == 0
+    monkeypatch.chdir(tmp_path / 'out')
+    calls.clear()
+    assert run(ids_file, tmp_path / 'out') == 0
+    assert calls == []
+
+
+def test_format_change_fetches_again(fetched, ids_file, tmp_path):
+    calls, _ = fetched
+    assert run(ids_file, tmp_path / 'out') == 0
+    calls.clear()
+    assert run(ids_file, tmp_path / 'out', '-f', 'json') == 0
+    assert sorted(calls) == ['32013L0036', '32019L0878', '52021PC0206']
+    with open(tmp_path / 'out' / '52021PC0206.json', encoding='utf-8') as f:
+        assert 'explantory_memorandum' in json.load(f)
+
+
+def test_parquet_outputs_share_schema(fetched, ids_file, tmp_path):
+    pytest.importorskip('pyarrow')
+    import pandas as pd
+
+    assert run(ids_file, tmp_path / 'out', '-f', 'parquet') == 0
+    paths = [str(tmp_path / 'out' / name) for name in ('52021PC0206.parquet', '32013L0036.parquet')]
+    df = pd.read_parquet(paths)
+    assert set(df['celex_id']) == {'52021PC0206', '32013L0036'}
+    assert df['table'].dropna().map(type).eq(str).all()
+    document = df[(df['kind'] == 'document') & (df['celex_id'] == '32013L0036')].iloc[0]
+    assert json.loads(document['document'])['summary']['title']
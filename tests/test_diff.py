@@ -0,0 +1,52 @@
+import copy
+import json
+import os
+
+from conftest import EXAMPLES_DIR
+from eurlex import diff_documents, diff_units, get_unit_fingerprint
+
+
+def load_example(celex_id):
+    with open(os.path.join(EXAMPLES_DIR, celex_id + '.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_identical_documents():
+    data = load_example('32013R0575')
+    articles = diff_documents(data, data)['articles']
+    assert articles['added'] == articles['removed'] == articles['modified'] == articles['moved'] == []
+    assert len(articles['unchanged']) == len(data['articles'])
+
+
+def test_changed_copy():
+    old = load_example('32013R0575')
+    new = copy.deepcopy(old)
+    ids = [article['id'] for article in old['articles']]
+
+    new['articles'][3]['text'] += ' New sentence.'
+    new['articles'][5]['text'] = new['articles'][5]['text'].replace(' ', '  ')
+    del new['articles'][10]
+    new['articles'].insert(0, {'id': 'Article 0', 'title': 'New', 'text': 'New article.'})
+    new['articles'].insert(40, new['articles'].pop(20))
+    new['articles'][50]['metadata'] = {'PART X': 'Moved'}
+    new['annexes'][0]['table'] += '\n| x |'
+    for unit in new['articles'] + new['annexes']:
+        unit['fingerprint'] = get_unit_fingerprint(unit)
+
+    changes = diff_documents(old, new)
+    assert changes['articles']['added'] == ['Article 0']
+    assert changes['articles']['removed'] == [ids[10]]
+    assert changes['articles']['modified'] == [ids[3]]
+    assert changes['articles']['moved'] == [ids[20], new['articles'][50]['id']]
+    assert changes['annexes']['modified'] == [old['annexes'][0]['id']]
+
+
+def test_duplicate_ids():
+    old = [{'id': '', 'title': 'A', 'text': 'a'}, {'id': '', 'title': 'B', 'text': 'b'}]
+    new = [{'id': '', 'title': 'A', 'text': 'a'}, {'id': '', 'title': 'B', 'text': 'changed'},
+           {'id': '', 'title': 'C', 'text': 'c'}]
+    changes = diff_units(old, new)
+    assert changes['unchanged'] == ['']
+    assert changes['modified'] == [' #2']
+    assert changes['added'] == [' #3']
+    assert changes['removed'] == []
@@ -0,0 +1,50 @@
+import glob
+import json
+import os
+
+import pytest
+
+from conftest import EXAMPLES_DIR
+from result_model import Document, load_corpus
+
+EXAMPLE_PATHS = sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.json')))
+
+
+@pytest.mark.parametrize('path', EXAMPLE_PATHS, ids=os.path.basename)
+def test_round_trip(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    document = Document.from_dict(data)
+    assert json.dumps(document.to_dict(), indent=4) == json.dumps(data, indent=4)
+
+
+def test_notes_stored_once():
+    with open(os.path.join(EXAMPLES_DIR, '32013R0575.json'), encoding='utf-8') as f:
+        data = json.load(f)
+    document = Document.from_dict(data)
+    article_notes = sum(len(article['notes']) for article in data['articles'])
+    assert len(document.notes) < len(data['notes']) + article_notes
+    article = next(article for article in document.articles if article.note_ids)
+    assert document.article_notes(article)[0].text
+
+
+def test_none_values_round_trip():
+    data = {
+        'title': 'Title',
+        'preamble': None,
+        'articles': [{'id': 'Article 1', 'title': '', 'text': '', 'metadata': None, 'notes': None, 'references': None}],
+        'notes': None,
+        'references': None,
+        'annexes': None,
+        'summary': None,
+    }
+    assert Document.from_dict(data).to_dict() == data
+
+
+def test_load_corpus_shares_strings():
+    corpus = load_corpus([json.load(open(path, encoding='utf-8')) for path in EXAMPLE_PATHS[:2]])
+    articles = [article for document in corpus for article in document.articles]
+    first, second = next(
+        (a, b) for a, b in zip(articles, articles[1:]) if a.metadata and a.metadata == b.metadata
+    )
+    assert first.metadata is second.metadata
@@ -0,0 +1,90 @@
+import copy
+import glob
+import json
+import os
+
+import pytest
+
+from conftest import EXAMPLES_DIR
+from search_index import build_index_from_json_files, normalize_reference
+
+
+@pytest.fixture
+def index(tmp_path):
+    paths = sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.json')))
+    index = build_index_from_json_files(paths, str(tmp_path / 'index.db'))
+    yield index
+    index.close()
+
+
+def load_example(celex_id):
+    with open(os.path.join(EXAMPLES_DIR, celex_id + '.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_build(index):
+    assert index.documents() == ['32013L0036', '32013R0575', '32019L0878', '32019R0876', '32022R2554', '52021PC0206']
+
+
+def test_search(index):
+    results = index.search('liquidity coverage', limit=5)
+    assert results
+    assert all(r['celex_id'] and r['id'] for r in results)
+
+
+def test_search_filters(index):
+    results = index.search('credit', celex_id='32013L0036', kind='annex')
+    assert results
+    assert all(r['celex_id'] == '32013L0036' and r['kind'] == 'annex' for r in results)
+
+
+@pytest.mark.parametrize('query', ['own-funds', "institution's", 'Article 4(1)', 'Directive 2013/36/EU', 'AND'])
+def test_search_keywords_are_not_fts_syntax(index, query):
+    assert index.search(query)
+
+
+def test_search_keyword_phrase(index):
+    results = index.search('own-funds', celex_id='32013R0575', limit=100)
+    assert all(r['celex_id'] == '32013R0575' for r in results)
+    assert '[own funds]' in ' '.join(r['snippet'] for r in results)
+
+
+def test_search_empty_query(index):
+    assert index.search('') == []
+
+
+def test_search_raw(index):
+    assert index.search('liquidity OR "own funds"', raw=True)
+
+
+def test_search_metadata(index):
+    results = index.search_metadata('PART SIX', celex_id='32013R0575')
+    assert results and all('PART SIX' in r['metadata'] for r in results)
+
+
+@pytest.mark.parametrize('variant', ['Regulation (EU) No 575/2013', 'Regulation (EU) 575/2013', 'regulation 575/2013'])
+def test_normalize_reference(variant):
+    assert normalize_reference(variant) == 'regulation 575/2013'
+
+
+def test_search_references(index):
+    expected = index.search_references('Directive 2013/36/EU')
+    assert expected
+    assert index.search_references('Directive 2013/36/ eu') == expected
+
+
+def test_reindex(index):
+    data = load_example('32013L0036')
+    assert not index.add_document('32013L0036', data)
+
+    changed = copy.deepcopy(data)
+    changed['articles'][0]['text'] += ' zzzuniqueword'
+    assert index.add_document('32013L0036', changed)
+    assert [r['id'] for r in index.search('zzzuniqueword')] == [data['articles'][0]['id']]
+
+    assert index.add_document('32013L0036', data)
+    assert index.search('zzzuniqueword') == []
+
+    index.remove_document('32013L0036')
+    assert '32013L0036' not in index.documents()
+    assert index.search('capital', celex_id='32013L0036') == []